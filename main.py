@@ -1,69 +1,68 @@
 # Python
-from typing import Optional
-from enum import Enum
+import os
+from functools import lru_cache
+from typing import Literal
 
 # Pydantic
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, constr
 
 
 # FastAPI
-from fastapi import FastAPI, UploadFile, status, HTTPException
+from fastapi import FastAPI, UploadFile, Response, status, HTTPException
 from fastapi import Body, Query, Path, Form, Cookie, Header, File
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from fastapi.middleware.gzip import GZipMiddleware
 
-app = FastAPI()
+# Uvicorn
+import uvicorn
+
+# Settings
+
+
+class Settings(BaseModel):
+    host: str
+    port: int
+    workers: int
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings(
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=os.environ.get("PORT", 8000),
+        workers=os.environ.get("WORKERS", os.cpu_count() or 1)
+    )
+
+
+app = FastAPI(default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
 
 # Models
 
+ShortStr = constr(min_length=1, max_length=20)
+MedStr = constr(min_length=1, max_length=50)
+
 
-class HairColor(Enum):
-    white = "white"
-    brown = "brown"
-    black = "black"
-    blonde = "blonde"
-    red = "red"
-    blue = "blue"
+HairColor = Literal["white", "brown", "black", "blonde", "red", "blue"]
 
 
 class Location(BaseModel):
-    city: str = Field(
-        ...,
-        min_length=1,
-        max_length=20,
-        example="Eclhe"
-    )
+    city: ShortStr = Field(..., example="Eclhe")
 
-    state: str = Field(
-        ...,
-        min_length=1,
-        max_length=20,
-        example="Alicante"
-    )
-    country: str = Field(
-        ...,
-        min_length=1,
-        max_length=20,
-        example="Spain"
-    )
+    state: ShortStr = Field(..., example="Alicante")
+    country: ShortStr = Field(..., example="Spain")
 
 
 class PersonBase(BaseModel):
-    first_name: str = Field(
-        ...,
-        min_length=1,
-        max_length=50
-    )
-    last_name: str = Field(
-        ...,
-        min_length=1,
-        max_length=50
-    )
+    first_name: MedStr
+    last_name: MedStr
     age: int = Field(
         ...,
         gt=0,
         lt=115
     )
-    hair_color: Optional[HairColor] = Field(default=None)
-    is_married: Optional[bool] = Field(default=None)
+    hair_color: HairColor | None = Field(default=None)
+    is_married: bool | None = Field(default=None)
 
     class Config:
         schema_extra = {
@@ -86,7 +85,18 @@ class PersonOut(PersonBase):
 
 
 class LoginOut(BaseModel):
-    username: str = Field(..., max_length=20, exmple="luissberenguer")
+    username: str = Field(..., max_length=20, example="luissberenguer")
+
+
+class PersonUpdate(BaseModel):
+    person: Person
+    location: Location
+
+
+HOME_RESPONSE = Response(
+    content=b'{"Hello":"World"}',
+    media_type="application/json"
+)
 
 
 @app.get(
@@ -94,8 +104,8 @@ class LoginOut(BaseModel):
     status_code=status.HTTP_200_OK,
     tags=["Otros"]
 )
-def home():
-    return {"Hello": "World"}
+async def home():
+    return HOME_RESPONSE
 
 # Request and response body
 
@@ -107,7 +117,7 @@ def home():
     tags=["Persons"],
     summary="Creates Person in the app"
 )
-def create_person(person: Person = Body(...)):
+async def create_person(person: Person = Body(...)):
     """"
     Create Person 
 
@@ -129,8 +139,8 @@ def create_person(person: Person = Body(...)):
     tags=["Persons"],
     deprecated=True
 )
-def show_person(
-    name: Optional[str] = Query(
+async def show_person(
+    name: str | None = Query(
         None,
         min_length=1,
         max_length=50,
@@ -145,7 +155,7 @@ def show_person(
         example=24
     ),
 ):
-    return {name: age}
+    return ORJSONResponse(content={name: age})
 
 # Vlidaciones: Path Parameters
 
@@ -155,7 +165,7 @@ def show_person(
     status_code=status.HTTP_200_OK,
     tags=["Persons"]
 )
-def show_person(
+async def show_person(
     peron_id: int = Path(
         ...,
         gt=0,
@@ -163,12 +173,12 @@ def show_person(
         description="This is the person id. It's required.",
     )
 ):
-    return {peron_id: 'Ese id existe!'}
+    return ORJSONResponse(content={peron_id: 'Ese id existe!'})
 
 # Validaciones: Request Body
 
 
-persons = [1, 2, 3, 4, 5]
+persons = frozenset({1, 2, 3, 4, 5})
 
 
 @app.put(
@@ -176,25 +186,22 @@ persons = [1, 2, 3, 4, 5]
     status_code=status.HTTP_200_OK,
     tags=["Persons"]
 )
-def update_person(
+async def update_person(
     person_id: int = Path(
         ...,
         title="Person ID",
         description="This is the person ID",
         gt=0
     ),
-    person: Person = Body(...),
-    location: Location = Body(...),
+    body: PersonUpdate = Body(...),
 ):
-    results = person.dict()
-    results.update(location.dict())
-    # person.dict() & location.dict()   # Esta sintaxis no la soporta Fast API
     if person_id not in persons:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="This person does not exist."
         )
-    return results
+    results = body.person.dict() | body.location.dict()
+    return ORJSONResponse(content=results)
 
 
 @app.post(
@@ -203,7 +210,7 @@ def update_person(
     status_code=status.HTTP_200_OK,
     tags=["Otros"]
 )
-def login(username: str = Form(...), password: str = Form(...)):
+async def login(username: str = Form(...), password: str = Form(...)):
     return LoginOut(username=username)
 
 
@@ -212,9 +219,10 @@ def login(username: str = Form(...), password: str = Form(...)):
 @app.post(
     path="/contact",
     status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse,
     tags=["Otros"]
 )
-def contact(
+async def contact(
     first_name: str = Form(
         ...,
         max_length=20,
@@ -230,10 +238,10 @@ def contact(
         ...,
         min_length=20,
     ),
-    user_agent: Optional[str] = Header(default=None),
-    ads: Optional[str] = Cookie(default=None)
+    user_agent: str | None = Header(default=None),
+    ads: str | None = Cookie(default=None)
 ):
-    return user_agent
+    return user_agent or ""
 
 
 # Files
@@ -242,11 +250,27 @@ def contact(
     path="/post-image",
     tags=["Otros"]
 )
-def post_image(
+async def post_image(
     image: UploadFile = File(...)
 ):
+    # Calculamos el peso con seek/tell, sin cargar el fichero en memoria
+    image.file.seek(0, os.SEEK_END)
+    size = image.file.tell()
+    image.file.seek(0)
     return {
         "Filename": image.filename,
         "Format": image.content_type,
-        "Size(kb)": round(len(image.file.read())/1024, ndigits=2)
+        "Size(kb)": round(size/1024, ndigits=2)
     }
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    uvicorn.run(
+        "main:app",
+        host=settings.host,
+        port=settings.port,
+        loop="uvloop",
+        http="httptools",
+        workers=settings.workers
+    )